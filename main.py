@@ -1,31 +1,147 @@
+import ast
 import asyncio
+import base64
 import json
 import os
 import shutil
 import sys
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from functools import lru_cache
 from io import BytesIO
 
-import httpx
+import aiohttp
 import mercantile
+import numexpr as ne
 import numpy as np
-from aiocache import cached
-from fastapi import BackgroundTasks, FastAPI, HTTPException, Query, Response
+import orjson
+import simplejpeg
+from aiocache import Cache
+from aiocache.serializers import BaseSerializer
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Path, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from matplotlib import pyplot as plt
 from PIL import Image
 from rio_tiler.io import COGReader
-from shapely.geometry import box, mapping
+from shapely.geometry import box, mapping, shape
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 
-from src.scog_compute.engine import compute as compute_engine
+from src.scog_compute.formula import FormulaError, validate_formula
+from src.scog_compute.kernels import ndvi_colormap
+
+# GDAL settings for remote COG access, applied before the first COG is opened.
+# The header (IFD) of a COG is read with a single ranged GET and kept in the
+# process-wide /vsicurl/ block cache, so further tiles of the same scene only
+# pay for the pixel range request. Consecutive ranges are merged into one
+# request and transient S3 errors are retried instead of failing the tile.
+# HTTP/2 multiplexing is only used where the server supports it; the S3
+# hosting the Sentinel-2 COGs speaks HTTP/1.1, so there GDAL negotiates down
+# and reads use its regular connection pool.
+GDAL_CONFIG = {
+    "GDAL_INGESTED_BYTES_AT_OPEN": "32768",
+    "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+    "CPL_VSIL_CURL_CACHE_SIZE": "200000000",
+    "GDAL_NUM_THREADS": "ALL_CPUS",
+    "GDAL_HTTP_MULTIPLEX": "YES",
+    "GDAL_HTTP_VERSION": "2",
+    "GDAL_HTTP_MERGE_CONSECUTIVE_RANGES": "YES",
+    "GDAL_HTTP_MAX_RETRY": "3",
+    "GDAL_HTTP_RETRY_DELAY": "0.5",
+}
+for key, value in GDAL_CONFIG.items():
+    os.environ.setdefault(key, value)
+
+# Open readers kept per cog_pool thread (rasterio datasets are not thread safe).
+# Header reuse comes from the shared /vsicurl/ cache; this only saves re-opening
+# the most recent scenes, so it is kept small to bound open handles.
+COG_READER_CACHE_SIZE = 4
+COG_POOL_WORKERS = 16
+
+# Output tiles are read straight onto the 256px GoogleMapsCompatible grid.
+# rio-tiler warps each request at the tile's own resolution, so GDAL picks the
+# matching COG overview by itself. The tilesize and nearest resampling and
+# reprojection passed to cog.tile() are rio-tiler's defaults, pinned here so
+# they stay explicit; they do not change how tiles are read. Reads only map
+# 1:1 onto internal blocks when the COG itself is tiled on that grid (256px
+# tiles, 128px overview blocks); for UTM scenes such as Sentinel-2 L2A a web
+# tile still touches the few internal blocks it overlaps.
+TILE_SIZE = 256
+
+# Rendered tiles are cached in a store shared by every worker. Point
+# TILE_CACHE_URL at Redis (e.g. redis://localhost:6379/0) for multi-worker
+# deployments; the in-memory default only serves the current process.
+# Entries expire after TILE_CACHE_TTL; there is no endpoint to flush them.
+TILE_CACHE_TTL = 3600
+
+
+class TileSerializer(BaseSerializer):
+    """
+    Store (image_bytes, datetime, cloud_cover, media_type) as JSON with the
+    image base64 encoded, so nothing read back from the shared store is unpickled
+    """
+
+    DEFAULT_ENCODING = None
+
+    def dumps(self, value):
+        image_bytes, image_date, image_cloud_cover, media_type = value
+        return orjson.dumps(
+            [
+                base64.b64encode(image_bytes).decode("ascii"),
+                image_date,
+                image_cloud_cover,
+                media_type,
+            ]
+        )
+
+    def loads(self, value):
+        if value is None:
+            return None
+        image_b64, image_date, image_cloud_cover, media_type = orjson.loads(value)
+        return base64.b64decode(image_b64), image_date, image_cloud_cover, media_type
+
+
+tile_cache = Cache.from_url(os.environ.get("TILE_CACHE_URL", "memory://"))
+tile_cache.serializer = TileSerializer()
+tile_cache.namespace = "tiles"
+
+app = FastAPI(default_response_class=ORJSONResponse)
+
+STAC_API_URL = "https://earth-search.aws.element84.com/v1/search"
+STAC_SEARCH_TEMPLATE = {"collections": ["sentinel-2-l2a"]}
+# aiohttp defaults to a 300s total timeout; keep STAC calls bounded so a stalled
+# search fails fast instead of holding every tile waiting on it
+STAC_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+
 
-app = FastAPI()
+@app.on_event("startup")
+async def startup():
+    # One pooled session for every STAC call, so keep-alive connections and
+    # resolved DNS entries are reused instead of re-negotiated per request.
+    app.state.http = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=100, limit_per_host=30, ttl_dns_cache=300, keepalive_timeout=75
+        ),
+        timeout=STAC_TIMEOUT,
+    )
+    # Dedicated pool for COG reads; GDAL releases the GIL during I/O, so these
+    # threads scale with read concurrency without starving the default executor.
+    app.state.cog_pool = ThreadPoolExecutor(
+        max_workers=COG_POOL_WORKERS, thread_name_prefix="cog"
+    )
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await app.state.http.close()
+    app.state.cog_pool.shutdown(wait=False, cancel_futures=True)
+    await tile_cache.close()
 
 
 class TimeoutMiddleware(BaseHTTPMiddleware):
@@ -65,6 +181,24 @@ async def read_index(request: Request):
 with open("data/sentinel-2-bands.json") as f:
     sentinel2_assets = json.load(f)
 
+# Band metadata is static, so both responses of /sentinel2-bands are built and
+# serialized once at import
+_BAND_SUMMARY_BYTES = orjson.dumps(
+    {key: value["title"] for key, value in sentinel2_assets.items()}
+)
+_BAND_FILTERED_BYTES = {
+    key: orjson.dumps(
+        {
+            "type": value.get("type"),
+            "title": value.get("title"),
+            "eo:bands": value.get("eo:bands"),
+            "gsd": value.get("gsd"),
+            "raster:bands": value.get("raster:bands"),
+        }
+    )
+    for key, value in sentinel2_assets.items()
+}
+
 
 @app.get("/list-files")
 async def list_files():
@@ -97,29 +231,75 @@ async def get_sentinel2_bands(
     band: str = Query(None, description="Band name to filter")
 ):
     if band:
-        if band in sentinel2_assets:
-            band_data = sentinel2_assets[band]
-            filtered_data = {
-                "type": band_data.get("type"),
-                "title": band_data.get("title"),
-                "eo:bands": band_data.get("eo:bands"),
-                "gsd": band_data.get("gsd"),
-                "raster:bands": band_data.get("raster:bands"),
-            }
-            return filtered_data
+        if band in _BAND_FILTERED_BYTES:
+            return Response(
+                content=_BAND_FILTERED_BYTES[band], media_type="application/json"
+            )
         else:
             raise HTTPException(status_code=404, detail="Band not found")
     else:
-        return {key: value["title"] for key, value in sentinel2_assets.items()}
+        return Response(content=_BAND_SUMMARY_BYTES, media_type="application/json")
+
+
+_cog_readers = threading.local()
+
+
+@contextmanager
+def cog_reader(url):
+    """
+    Yield an open COGReader for url, reused across calls on the same thread
+    """
+    readers = getattr(_cog_readers, "readers", None)
+    if readers is None:
+        readers = _cog_readers.readers = OrderedDict()
+
+    cog = readers.pop(url, None)
+    if cog is None:
+        cog = COGReader(url)
+    try:
+        yield cog
+    except Exception:
+        cog.close()
+        raise
+
+    readers[url] = cog
+    if len(readers) > COG_READER_CACHE_SIZE:
+        _, oldest = readers.popitem(last=False)
+        oldest.close()
 
 
 async def fetch_tile(url, x, y, z):
     def read_tile():
-        with COGReader(url) as cog:
-            tile, _ = cog.tile(x, y, z)
+        with cog_reader(url) as cog:
+            tile, _ = cog.tile(
+                x,
+                y,
+                z,
+                tilesize=TILE_SIZE,
+                resampling_method="nearest",
+                reproject_method="nearest",
+            )
             return tile
 
-    return await asyncio.to_thread(read_tile)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(app.state.cog_pool, read_tile)
+
+
+def formula_error_response(formula, band2):
+    """
+    Return a 400 response for an invalid formula, or None
+
+    With two bands the formula is always evaluated, so it is checked up front.
+    Single assets are only checked once fetched: multi-band ones (visual)
+    ignore the formula
+    """
+    if not band2:
+        return None
+    try:
+        validate_formula(formula)
+    except FormulaError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+    return None
 
 
 @app.get("/export")
@@ -173,6 +353,9 @@ async def compute_aoi_over_time(
             },
             status_code=400,
         )
+    error_response = formula_error_response(formula, band2)
+    if error_response is not None:
+        return error_response
     print("Received request for formula : ", formula)
     bbox = list(map(float, bbox.split(",")))
 
@@ -207,6 +390,10 @@ async def run_computation(
     timeseries,
     output_dir,
 ):
+    # Imported here so matplotlib and the rest of the export stack are only
+    # loaded by workers that actually run an export
+    from src.scog_compute.engine import compute as compute_engine
+
     log_file = "static/runtime.log"
     if os.path.exists(log_file):
         os.remove(log_file)
@@ -253,29 +440,181 @@ async def search_images(
     bbox_polygon = box(west, south, east, north)
     bbox_geojson = mapping(bbox_polygon)
 
-    STAC_API_URL = "https://earth-search.aws.element84.com/v1/search"
     search_params = {
-        "collections": ["sentinel-2-l2a"],
+        **STAC_SEARCH_TEMPLATE,
         "datetime": f"{start_date}T00:00:00Z/{end_date}T23:59:59Z",
         "query": {"eo:cloud_cover": {"lt": cloud_cover}},
         "intersects": bbox_geojson,
         "limit": 100,
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(STAC_API_URL, json=search_params)
-    if response.status_code != 200:
-        return JSONResponse(
-            content={"error": "Error searching STAC API"},
-            status_code=500,
+    async with app.state.http.post(STAC_API_URL, json=search_params) as response:
+        if response.status != 200:
+            return JSONResponse(
+                content={"error": "Error searching STAC API"},
+                status_code=500,
+            )
+        # Pass the STAC response through as-is instead of decoding and re-encoding it
+        content = await response.read()
+    return Response(content=content, media_type="application/json")
+
+
+NDVI_FORMULA = "(band2 - band1) / (band2 + band1)"
+_NDVI_FORMULA_AST = ast.dump(ast.parse(NDVI_FORMULA, mode="eval"))
+
+
+@lru_cache(maxsize=256)
+def _compile_formula(formula, bands):
+    tree = validate_formula(formula, bands)
+    names = sorted({node.id for node in ast.walk(tree) if isinstance(node, ast.Name)})
+    # numexpr's "float" kind is float32
+    return ne.NumExpr(formula, [(name, float) for name in names])
+
+
+def evaluate_formula(formula, bands):
+    """
+    Evaluate formula over the band arrays in a single fused numexpr pass
+    """
+    expr = _compile_formula(formula, tuple(bands))
+    result = expr(*(bands[name] for name in expr.input_names))
+    return np.nan_to_num(result, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+@lru_cache(maxsize=256)
+def is_ndvi_formula(formula):
+    """
+    Whether formula is the default NDVI, regardless of spacing or extra parentheses
+    """
+    try:
+        return ast.dump(ast.parse(formula, mode="eval")) == _NDVI_FORMULA_AST
+    except SyntaxError:
+        return False
+
+
+def render_ndvi(band1, band2):
+    """
+    NDVI fast path, fused NDVI + colormap straight from the raw band planes
+    """
+    rgb = np.empty((*band1.shape, 3), dtype=np.uint8)
+    return Image.fromarray(ndvi_colormap(band1, band2, _RDYLGN_LUT, rgb))
+
+
+def planar_to_interleaved(bands):
+    """
+    Convert band-planar (bands, rows, cols) pixels into interleaved (rows, cols, bands)
+    """
+    # Tiles stay planar through the compute path; interleave exactly once here,
+    # straight into the C-contiguous buffer the encoders need
+    return np.ascontiguousarray(bands.transpose(1, 2, 0))
+
+
+def render_tile(band1, band2, formula):
+    """
+    Compute formula over the fetched tiles and encode them as (bytes, media type)
+    """
+    if band2 is not None and is_ndvi_formula(formula):
+        image = render_ndvi(band1[0], band2[0])
+    elif band2 is not None:
+        # Consider this is single band
+        # Perform custom calculation with two bands
+        band1 = band1[0].astype(np.float32, copy=False)
+        band2 = band2[0].astype(np.float32, copy=False)
+
+        result = evaluate_formula(formula, {"band1": band1, "band2": band2})
+        image = apply_colormap(result)
+    else:
+        inner_bands = band1.shape[0]
+        if inner_bands == 1:
+            # Single band image
+            band1 = band1[0].astype(np.float32, copy=False)
+            result = evaluate_formula(formula, {"band1": band1})
+            image = apply_colormap(result)
+        else:
+            # Multi band image
+            pixels = planar_to_interleaved(band1)
+            if pixels.shape[2] == 3 and pixels.dtype == np.uint8:
+                # True colour imagery does not need lossless tiles, encode the
+                # array directly with simplejpeg's bundled libjpeg-turbo
+                image_bytes = simplejpeg.encode_jpeg(
+                    pixels, quality=85, colorspace="RGB", colorsubsampling="420"
+                )
+                return image_bytes, "image/jpeg"
+            image = Image.fromarray(pixels)
+
+    buffered = BytesIO()
+    image.save(buffered, format="PNG")
+    image_bytes = buffered.getvalue()
+
+    return image_bytes, "image/png"
+
+
+# Tiles are grouped into supercells of 4x4 tiles (their ancestor two zoom levels
+# up). Concurrent tile requests of one supercell share a single STAC search,
+# then each tile picks the first returned scene that covers it.
+STAC_SUPERCELL_ZOOM_OFFSET = 2
+STAC_SUPERCELL_LIMIT = 10
+_supercell_searches = {}
+
+
+async def search_stac(geometry, start_date, end_date, cloud_cover, limit):
+    search_params = {
+        **STAC_SEARCH_TEMPLATE,
+        "datetime": f"{start_date}T00:00:00Z/{end_date}T23:59:59Z",
+        "query": {"eo:cloud_cover": {"lt": cloud_cover}},
+        "intersects": geometry,
+        "limit": limit,
+    }
+    async with app.state.http.post(STAC_API_URL, json=search_params) as response:
+        if response.status != 200:
+            raise HTTPException(status_code=404, detail="Error searching STAC API")
+        results = await response.json()
+    return results["features"]
+
+
+async def search_supercell(tile, start_date, end_date, cloud_cover):
+    """
+    Search the scenes of the supercell holding tile, sharing in-flight searches
+    """
+    cell = mercantile.parent(tile, zoom=tile.z - STAC_SUPERCELL_ZOOM_OFFSET)
+    key = (cell.z, cell.x, cell.y, start_date, end_date, cloud_cover)
+    search = _supercell_searches.get(key)
+    if search is None:
+        search = asyncio.ensure_future(
+            search_stac(
+                mercantile.feature(cell)["geometry"],
+                start_date,
+                end_date,
+                cloud_cover,
+                limit=STAC_SUPERCELL_LIMIT,
+            )
         )
+        _supercell_searches[key] = search
+        search.add_done_callback(lambda _: _supercell_searches.pop(key, None))
+    # Shielded so a cancelled tile request does not cancel the shared search
+    return await asyncio.shield(search)
 
-    results = response.json()
-    return results
 
+async def search_tile_feature(tile, start_date, end_date, cloud_cover):
+    """
+    First scene covering tile, picked from its supercell's search
+    """
+    bbox = mercantile.bounds(tile)
+    bbox_polygon = box(bbox.west, bbox.south, bbox.east, bbox.north)
 
-@cached(ttl=3600)
-async def cached_generate_tile(
+    features = await search_supercell(tile, start_date, end_date, cloud_cover)
+    feature = next(
+        (f for f in features if shape(f["geometry"]).intersects(bbox_polygon)), None
+    )
+    if feature is None and len(features) == STAC_SUPERCELL_LIMIT:
+        # The supercell page may not reach this tile's scenes, ask for it alone
+        features = await search_stac(
+            mapping(bbox_polygon), start_date, end_date, cloud_cover, limit=1
+        )
+        feature = features[0] if features else None
+    return feature
+
+
+async def generate_tile(
     x: int,
     y: int,
     z: int,
@@ -287,30 +626,12 @@ async def cached_generate_tile(
     formula: str,
 ) -> bytes:
     tile = mercantile.Tile(x, y, z)
-    bbox = mercantile.bounds(tile)
-    bbox_polygon = box(bbox.west, bbox.south, bbox.east, bbox.north)
-    bbox_geojson = mapping(bbox_polygon)
-    STAC_API_URL = "https://earth-search.aws.element84.com/v1/search"
-    search_params = {
-        "collections": ["sentinel-2-l2a"],
-        "datetime": f"{start_date}T00:00:00Z/{end_date}T23:59:59Z",
-        "query": {"eo:cloud_cover": {"lt": cloud_cover}},
-        "intersects": bbox_geojson,
-        "limit": 1,
-    }
-
-    async with httpx.AsyncClient() as client:
-        response = await client.post(STAC_API_URL, json=search_params)
-    if response.status_code != 200:
-        raise HTTPException(status_code=404, detail="Error searching STAC API")
-
-    results = response.json()
-    if not results["features"]:
+    feature = await search_tile_feature(tile, start_date, end_date, cloud_cover)
+    if feature is None:
         raise HTTPException(
             status_code=404, detail="No images found for the given parameters"
         )
 
-    feature = results["features"][0]
     band1_url = feature["assets"][band1]["href"]
     band2_url = feature["assets"][band2]["href"] if band2 else None
 
@@ -325,40 +646,22 @@ async def cached_generate_tile(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    if band2 is not None:
-        # Consider this is single band
-        # Perform custom calculation with two bands
-        band1 = band1[0].astype(float)
-        band2 = band2[0].astype(float)
-
-        result = eval(formula)
-        image = apply_colormap(result)
-    else:
-        inner_bands = band1.shape[0]
-        if inner_bands == 1:
-            # Single band image
-            band1 = band1[0].astype(float)
-            result = eval(formula)
-            image = apply_colormap(result)
-        else:
-            # Multi band image
-            band1 = band1.transpose(
-                1, 2, 0
-            )  # Transpose to (256, 256, 3) or (256, 256, 2)
-            image = Image.fromarray(band1)
-
-    buffered = BytesIO()
-    image.save(buffered, format="PNG")
-    image_bytes = buffered.getvalue()
+    loop = asyncio.get_running_loop()
+    image_bytes, media_type = await loop.run_in_executor(
+        app.state.cog_pool, render_tile, band1, band2, formula
+    )
 
-    return image_bytes, feature
+    # Only what the response headers need is kept next to the tile bytes, so a
+    # shared cache hit stays a small GET + unpickle
+    properties = feature["properties"]
+    return image_bytes, properties["datetime"], properties["eo:cloud_cover"], media_type
 
 
 @app.get("/tile/{z}/{x}/{y}")
 async def get_tile(
-    z: int,
-    x: int,
-    y: int,
+    z: int = Path(..., ge=10, le=16, description="Zoom level (10 to 16)"),
+    x: int = Path(...),
+    y: int = Path(...),
     start_date: str = Query(None),
     end_date: str = Query(None),
     cloud_cover: int = Query(30),
@@ -373,16 +676,14 @@ async def get_tile(
         description="Formula for custom band calculation (example: (band2 - band1) / (band2 + band1) for NDVI)",
     ),
 ):
-    if z < 10 or z > 16:
-        return JSONResponse(
-            content={"error": "Zoom level must be between 8 and 17"},
-            status_code=400,
-        )
     if band1 is None:
         return JSONResponse(
             content={"error": "Band1 is required"},
             status_code=400,
         )
+    error_response = formula_error_response(formula, band2)
+    if error_response is not None:
+        return error_response
     if not start_date:
         start_date = (datetime.now() - timedelta(days=30 * 12)).strftime("%Y-%m-%d")
     if not end_date:
@@ -390,25 +691,54 @@ async def get_tile(
 
     try:
         start_time = time.time()
-        image_bytes, feature = await cached_generate_tile(
-            x, y, z, start_date, end_date, cloud_cover, band1, band2, formula
-        )
+        cache_key = f"{z}/{x}/{y}:{band1}:{band2}:{formula}:{start_date}:{end_date}:{cloud_cover}"
+        # The cache only saves work, so a store outage degrades to rendering
+        try:
+            cached_tile = await tile_cache.get(cache_key)
+        except Exception as e:
+            print(f"Tile cache get failed : {e!r}")
+            cached_tile = None
+        cache_status = "HIT"
+        if cached_tile is None:
+            cache_status = "MISS"
+            cached_tile = await generate_tile(
+                x, y, z, start_date, end_date, cloud_cover, band1, band2, formula
+            )
+            try:
+                await tile_cache.set(cache_key, cached_tile, ttl=TILE_CACHE_TTL)
+            except Exception as e:
+                print(f"Tile cache set failed : {e!r}")
+        image_bytes, image_date, image_cloud_cover, media_type = cached_tile
         computation_time = time.time() - start_time
 
         headers = {
             "X-Computation-Time": str(computation_time),
-            "X-Image-Date": feature["properties"]["datetime"],
-            "X-Cloud-Cover": str(feature["properties"]["eo:cloud_cover"]),
+            "X-Image-Date": image_date,
+            "X-Cloud-Cover": str(image_cloud_cover),
+            "X-Cache": cache_status,
         }
 
-        return Response(content=image_bytes, media_type="image/png", headers=headers)
+        return Response(content=image_bytes, media_type=media_type, headers=headers)
+    except FormulaError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
     except Exception as ex:
         return JSONResponse(content={"error": "Computation Error"}, status_code=504)
 
 
+# matplotlib's RdYlGn sampled at 256 steps as uint8 RGB, dumped once with
+# (plt.get_cmap("RdYlGn")(np.linspace(0, 1, 256))[:, :3] * 255).astype(np.uint8)
+# so the tile server does not import matplotlib
+_RDYLGN_LUT = np.load("data/rdylgn_lut.npy")
+
+
 def apply_colormap(result):
-    result_normalized = (result - result.min()) / (result.max() - result.min())
-    colormap = plt.get_cmap("RdYlGn")
-    result_colored = colormap(result_normalized)
-    result_image = (result_colored[:, :, :3] * 255).astype(np.uint8)
-    return Image.fromarray(result_image)
+    # Normalize in place and quantize to uint8 once, then index the 256 entry
+    # RGB lookup table instead of building a float RGBA image per tile
+    result = np.ma.filled(result, 0).astype(np.float32, copy=False)
+    mn, mx = result.min(), result.max()
+    scale = np.float32(255.0 / (mx - mn)) if mx > mn else np.float32(0.0)
+    np.subtract(result, mn, out=result)
+    np.multiply(result, scale, out=result)
+    np.clip(result, 0, 255, out=result)
+    idx = result.astype(np.uint8, copy=False)
+    return Image.fromarray(_RDYLGN_LUT[idx])
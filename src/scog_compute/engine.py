@@ -14,6 +14,8 @@ from scipy.stats import mode
 from shapely.geometry import box, shape
 from tqdm import tqdm
 
+from src.scog_compute.formula import validate_formula
+
 
 def fetch_process_custom_band(band1_url, band2_url, bbox, formula):
     try:
@@ -59,11 +61,13 @@ def fetch_process_custom_band(band1_url, band2_url, bbox, formula):
                 band2 = None
             if band2 is not None:
                 band1 = band1.astype(float)
+                validate_formula(formula)
                 result = eval(formula)
             else:
                 inner_bands = band1.shape[0]
                 band1 = band1.astype(float)
                 if inner_bands == 1:
+                    validate_formula(formula, ("band1",))
                     result = eval(formula)
                 else:
                     result = band1
@@ -0,0 +1,60 @@
+import ast
+
+FORMULA_BANDS = ("band1", "band2")
+_FORMULA_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.Mod,
+    ast.Pow,
+    ast.UAdd,
+    ast.USub,
+)
+
+
+class FormulaError(ValueError):
+    pass
+
+
+def validate_formula(formula, bands=FORMULA_BANDS):
+    """
+    Parse formula and reject anything but arithmetic over the given band names
+    """
+    try:
+        tree = ast.parse(formula, mode="eval")
+    except SyntaxError:
+        raise FormulaError(f"Invalid formula : {formula}")
+
+    for node in ast.walk(tree):
+        if not isinstance(node, _FORMULA_NODES):
+            raise FormulaError(
+                f"Unsupported expression in formula : {type(node).__name__}"
+            )
+        if isinstance(node, ast.Name) and node.id not in bands:
+            raise FormulaError(
+                f"Unknown name in formula : {node.id}. Use {', '.join(bands)}"
+            )
+        if isinstance(node, ast.Constant) and (
+            isinstance(node.value, bool) or not isinstance(node.value, (int, float))
+        ):
+            raise FormulaError(f"Unsupported constant in formula : {node.value!r}")
+        # Constant subexpressions are folded with Python's eval (by numexpr and
+        # the export engine), so a power of constants like 9**9**9 would compute
+        # an unbounded integer before any band is touched
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+            if not any(isinstance(n, ast.Name) for n in ast.walk(node)):
+                raise FormulaError(
+                    "Powers of constants are not supported in formula, "
+                    "write the value instead"
+                )
+    # A formula of constants evaluates to a scalar, not a tile
+    if not any(isinstance(node, ast.Name) for node in ast.walk(tree)):
+        raise FormulaError(f"formula must reference {' or '.join(bands)}")
+    return tree
@@ -0,0 +1,26 @@
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, nogil=True)
+def ndvi_colormap(red, nir, lut, out):
+    """
+    Compute NDVI and colormap it into out (rows, cols, 3) in a single pass
+
+    NDVI is mapped from its fixed [-1, 1] range onto the 256 entries of lut, so
+    no min/max reduction over the tile is needed. Pixels where both bands are 0
+    (nodata) get the colour of NDVI 0.
+    """
+    rows, cols = red.shape
+    for i in range(rows):
+        for j in range(cols):
+            r = np.float32(red[i, j])
+            n = np.float32(nir[i, j])
+            total = n + r
+            value = (n - r) / total if total != 0 else np.float32(0.0)
+            idx = int((value + np.float32(1.0)) * np.float32(127.5))
+            idx = min(max(idx, 0), 255)
+            out[i, j, 0] = lut[idx, 0]
+            out[i, j, 1] = lut[idx, 1]
+            out[i, j, 2] = lut[idx, 2]
+    return out
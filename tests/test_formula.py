@@ -0,0 +1,53 @@
+import pytest
+
+from src.scog_compute.formula import FormulaError, validate_formula
+
+
+@pytest.mark.parametrize(
+    "formula",
+    [
+        "band1",
+        "(band2 - band1) / (band2 + band1)",
+        "(band2-band1)/(band2+band1)",
+        "band1 * 0.0001 - 0.1",
+        "-band1 % 3",
+        "band1 ** 2",
+        "band1 ** (1 / 2)",
+        "2 ** band1",
+    ],
+)
+def test_accepts_arithmetic(formula):
+    validate_formula(formula)
+
+
+@pytest.mark.parametrize(
+    "formula, message",
+    [
+        ('__import__("os").system("id")', "Call"),
+        ("abs(band1)", "Call"),
+        ("band1.real", "Attribute"),
+        ("band1[0]", "Subscript"),
+        ("lambda: band1", "Lambda"),
+        ("band1 if band2 else band2", "IfExp"),
+        ("band1 < band2", "Compare"),
+        ("band3 - band1", "Unknown name"),
+        ("visual", "Unknown name"),
+        ("True + band1", "Unsupported constant"),
+        ("'a' * band1", "Unsupported constant"),
+        ("band1 *", "Invalid formula"),
+        ("9**9**9**9", "Powers of constants"),
+        ("band1 ** 9**9**9", "Powers of constants"),
+        ("band1 + (2 * 4) ** (8 * 9999999)", "Powers of constants"),
+        ("2", "formula must reference band1 or band2"),
+        ("1 + 2", "formula must reference band1 or band2"),
+    ],
+)
+def test_rejects(formula, message):
+    with pytest.raises(FormulaError, match=message):
+        validate_formula(formula)
+
+
+def test_band2_rejected_without_band2():
+    validate_formula("band1 * 2", ("band1",))
+    with pytest.raises(FormulaError, match="Unknown name in formula : band2"):
+        validate_formula("(band2 - band1) / (band2 + band1)", ("band1",))
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+import main
+from src.scog_compute.kernels import ndvi_colormap
+
+
+def reference(red, nir):
+    ndvi = main.evaluate_formula(
+        main.NDVI_FORMULA,
+        {"band1": red.astype(np.float32), "band2": nir.astype(np.float32)},
+    )
+    idx = np.clip((ndvi + 1) * 127.5, 0, 255).astype(np.uint8)
+    return main._RDYLGN_LUT[idx]
+
+
+def render(red, nir):
+    out = np.empty((*red.shape, 3), dtype=np.uint8)
+    return ndvi_colormap(red, nir, main._RDYLGN_LUT, out)
+
+
+def test_matches_formula_path_on_uint16_bands():
+    rng = np.random.default_rng(0)
+    red = rng.integers(0, 10000, (256, 256), dtype=np.uint16)
+    nir = rng.integers(0, 10000, (256, 256), dtype=np.uint16)
+
+    np.testing.assert_array_equal(render(red, nir), reference(red, nir))
+
+
+def test_nodata_gets_the_colour_of_zero():
+    red = np.zeros((2, 2), dtype=np.uint16)
+    nir = np.zeros((2, 2), dtype=np.uint16)
+
+    rgb = render(red, nir)
+
+    assert (rgb == main._RDYLGN_LUT[127]).all()
+    np.testing.assert_array_equal(rgb, reference(red, nir))
+
+
+@pytest.mark.parametrize(
+    "red, nir, lut_index",
+    [
+        (0, 5000, 255),  # NDVI 1
+        (5000, 0, 0),  # NDVI -1
+        (3.0, -1.0, 0),  # NDVI -2, clamped to -1
+        (-1.0, 3.0, 255),  # NDVI 2, clamped to 1
+    ],
+)
+def test_clamps_to_the_ends_of_the_lut(red, nir, lut_index):
+    dtype = np.float32 if isinstance(red, float) else np.uint16
+    red = np.full((1, 1), red, dtype=dtype)
+    nir = np.full((1, 1), nir, dtype=dtype)
+
+    rgb = render(red, nir)
+
+    np.testing.assert_array_equal(rgb[0, 0], main._RDYLGN_LUT[lut_index])
+    np.testing.assert_array_equal(rgb, reference(red, nir))
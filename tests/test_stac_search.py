@@ -0,0 +1,105 @@
+import asyncio
+
+import mercantile
+import pytest
+
+import main
+
+TILE = mercantile.Tile(12073, 6918, 14)
+
+
+def scene(name, tile):
+    return {"id": name, "geometry": mercantile.feature(tile)["geometry"]}
+
+
+class FakeResponse:
+    def __init__(self, features):
+        self.status = 200
+        self.features = features
+
+    async def json(self):
+        await asyncio.sleep(0.01)
+        return {"features": self.features}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class FakeSession:
+    def __init__(self, *pages):
+        self.pages = list(pages)
+        self.searches = []
+
+    def post(self, url, json=None):
+        self.searches.append(json)
+        return FakeResponse(self.pages.pop(0))
+
+
+@pytest.fixture
+def session():
+    def install(*pages):
+        main.app.state.http = FakeSession(*pages)
+        return main.app.state.http
+
+    yield install
+    del main.app.state.http
+
+
+def test_concurrent_tiles_share_one_supercell_search(session):
+    http = session([scene("S2A", TILE)])
+    neighbours = [mercantile.Tile(TILE.x + dx, TILE.y, TILE.z) for dx in range(2)]
+
+    async def run():
+        return await asyncio.gather(
+            *[
+                main.search_tile_feature(tile, "2024-01-01", "2024-02-01", 30)
+                for tile in neighbours
+            ]
+        )
+
+    features = asyncio.run(run())
+
+    assert len(http.searches) == 1
+    assert http.searches[0]["limit"] == main.STAC_SUPERCELL_LIMIT
+    assert http.searches[0]["collections"] == ["sentinel-2-l2a"]
+    assert [f["id"] for f in features] == ["S2A", "S2A"]
+    assert main._supercell_searches == {}
+
+
+def test_first_scene_covering_the_tile_is_picked(session):
+    elsewhere = mercantile.Tile(TILE.x + 3, TILE.y + 3, TILE.z)
+    session([scene("far", elsewhere), scene("near", TILE)])
+
+    feature = asyncio.run(
+        main.search_tile_feature(TILE, "2024-01-01", "2024-02-01", 30)
+    )
+
+    assert feature["id"] == "near"
+
+
+def test_full_page_without_cover_falls_back_to_tile_search(session):
+    elsewhere = mercantile.Tile(TILE.x + 3, TILE.y + 3, TILE.z)
+    full_page = [scene(f"far{i}", elsewhere) for i in range(main.STAC_SUPERCELL_LIMIT)]
+    http = session(full_page, [scene("tile", TILE)])
+
+    feature = asyncio.run(
+        main.search_tile_feature(TILE, "2024-01-01", "2024-02-01", 30)
+    )
+
+    assert feature["id"] == "tile"
+    assert [s["limit"] for s in http.searches] == [main.STAC_SUPERCELL_LIMIT, 1]
+
+
+def test_partial_page_without_cover_has_no_scene(session):
+    elsewhere = mercantile.Tile(TILE.x + 3, TILE.y + 3, TILE.z)
+    http = session([scene("far", elsewhere)])
+
+    feature = asyncio.run(
+        main.search_tile_feature(TILE, "2024-01-01", "2024-02-01", 30)
+    )
+
+    assert feature is None
+    assert len(http.searches) == 1
@@ -0,0 +1,43 @@
+import asyncio
+
+import main
+
+TILE = (b"\xff\xd8tile", "2024-05-01T10:00:00Z", 12.5, "image/jpeg")
+
+
+class BrokenCache:
+    async def get(self, key):
+        raise ConnectionError("redis down")
+
+    async def set(self, key, value, ttl=None):
+        raise ConnectionError("redis down")
+
+
+def test_serializer_round_trip():
+    serializer = main.TileSerializer()
+    assert serializer.loads(serializer.dumps(TILE)) == TILE
+    assert serializer.loads(None) is None
+
+
+def test_tile_rendered_when_cache_fails(monkeypatch):
+    async def generate_tile(*args):
+        return TILE
+
+    monkeypatch.setattr(main, "tile_cache", BrokenCache())
+    monkeypatch.setattr(main, "generate_tile", generate_tile)
+    response = asyncio.run(
+        main.get_tile(
+            12,
+            1,
+            1,
+            start_date="2024-01-01",
+            end_date="2024-06-01",
+            cloud_cover=30,
+            band1="visual",
+            band2=None,
+            formula="band1",
+        )
+    )
+    assert response.status_code == 200
+    assert response.body == TILE[0]
+    assert response.headers["X-Cache"] == "MISS"